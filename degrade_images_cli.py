@@ -60,6 +60,8 @@ def _build_parser() -> argparse.ArgumentParser:
 
     parser.add_argument('--tesseract-cmd')
     parser.add_argument('--skip-tesseract', action='store_true')
+    parser.add_argument('--skip-psnr', action='store_true', help='Do not compute PSNR against the source image.')
+    parser.add_argument('--num-workers', type=int, help='Number of worker processes (defaults to the CPU count).')
     return parser
 
 
@@ -111,6 +113,8 @@ def main(argv: Optional[List[str]] = None) -> None:
         min_filter_radius_max=args.min_filter_radius_max,
         tesseract_cmd=args.tesseract_cmd,
         run_tesseract=not args.skip_tesseract,
+        num_workers=args.num_workers,
+        compute_psnr=not args.skip_psnr,
     )
 
 
@@ -0,0 +1,32 @@
+"""Numba kernel computing the Levenshtein distance of short strings."""
+
+import numpy as np
+from numba import njit
+
+
+@njit(cache=True, boundscheck=False)
+def _lev(a: np.ndarray, b: np.ndarray) -> int:
+    """Levenshtein distance of two arrays of character codes, with the two-row DP."""
+    cols = b.shape[0] + 1
+    prev = np.arange(cols)
+    curr = np.empty(cols, dtype=prev.dtype)
+    for i in range(a.shape[0]):
+        curr[0] = i + 1
+        character = a[i]
+        for j in range(1, cols):
+            if character == b[j - 1]:
+                cost = prev[j - 1]
+            else:
+                cost = min(prev[j - 1], prev[j], curr[j - 1]) + 1
+            curr[j] = cost
+        prev, curr = curr, prev
+    return prev[cols - 1]
+
+
+def _char_codes(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode('utf-32-le', errors='surrogatepass'), dtype=np.int32)
+
+
+def edit_distance(text: str, pattern: str) -> int:
+    """Levenshtein distance, the row buffers have the length of `pattern` so it should be the shorter string."""
+    return int(_lev(_char_codes(text), _char_codes(pattern)))
@@ -1,19 +1,20 @@
 """Blur utilities for image datasets."""
 
-import glob
 import os
 
-import PIL
+import cv2 as cv
 import numpy as np
 from PIL import Image, ImageFilter
 
+from .io_utils import list_files
+
 
 _FILTERS = {
-    'gaussian': lambda image, radius: image.filter(ImageFilter.GaussianBlur(radius)),
-    'box': lambda image, radius: image.filter(ImageFilter.BoxBlur(radius)),
-    'min': lambda image, radius: image.filter(ImageFilter.MinFilter(radius)),
-    'max': lambda image, radius: image.filter(ImageFilter.MaxFilter(radius)),
-    'median': lambda image, radius: image.filter(ImageFilter.MedianFilter(radius)),
+    'gaussian': ImageFilter.GaussianBlur,
+    'box': ImageFilter.BoxBlur,
+    'min': ImageFilter.MinFilter,
+    'max': ImageFilter.MaxFilter,
+    'median': ImageFilter.MedianFilter,
 }
 
 
@@ -34,48 +35,49 @@ def blur_images(input_dir: str, filename: str, filter_name: str, radius: int, ou
     os.makedirs(output_dir, exist_ok=True)
 
     if filename:
-        candidates = [os.path.join(input_dir, filename)]
+        image_path = os.path.join(input_dir, filename)
+        candidates = [image_path] if os.path.isfile(image_path) else []
     else:
-        candidates = glob.glob(os.path.join(input_dir, '*.*'))
+        candidates = list_files(input_dir)
 
     if not candidates:
         raise ValueError('No images found to process.')
 
-    processed = 0
+    image_filter = _FILTERS[filter_key](radius)
     for image_path in candidates:
-        if not os.path.isfile(image_path):
-            continue
         image = Image.open(image_path)
-        result_image = _FILTERS[filter_key](image, radius)
+        result_image = image.filter(image_filter)
         base_name = os.path.splitext(os.path.basename(image_path))[0]
         output_path = os.path.join(output_dir, f'{base_name}_{filter_key}_r{radius}.png')
         result_image.save(output_path)
-        processed += 1
 
-    if processed == 0:
-        raise ValueError('No valid images found to process.')
+
+def _rect_kernel(size: int) -> np.ndarray:
+    return cv.getStructuringElement(cv.MORPH_RECT, (size, size))
 
 
 def gaussian_blur(image: np.array, radius=1) -> np.array:
-    blured = PIL.Image.fromarray(np.uint8(image)).filter(ImageFilter.GaussianBlur(radius))
-    return np.asarray(blured)
+    if radius <= 0:
+        return image
+    return cv.GaussianBlur(image, (0, 0), sigmaX=radius)
 
 
 def box_blur(image: np.array, radius=1) -> np.array:
-    blured = PIL.Image.fromarray(np.uint8(image)).filter(ImageFilter.BoxBlur(radius))
-    return np.asarray(blured)
+    if radius <= 0:
+        return image
+    return cv.blur(image, (2 * radius + 1, 2 * radius + 1))
 
 
 def min_filter(image: np.array, radius=3) -> np.array:
-    blured = PIL.Image.fromarray(np.uint8(image)).filter(ImageFilter.MinFilter(radius))
-    return np.asarray(blured)
+    return cv.erode(image, _rect_kernel(radius))
 
 
 def max_filter(image: np.array, radius=3) -> np.array:
-    blured = PIL.Image.fromarray(np.uint8(image)).filter(ImageFilter.MaxFilter(radius))
-    return np.asarray(blured)
+    return cv.dilate(image, _rect_kernel(radius))
 
 
 def median_filter(image: np.array, radius=3) -> np.array:
-    blured = PIL.Image.fromarray(np.uint8(image)).filter(ImageFilter.MedianFilter(radius))
-    return np.asarray(blured)
+    if image.dtype != np.uint8 and radius > 5:
+        # OpenCV only has float median kernels up to 5x5
+        return cv.medianBlur(np.clip(image, 0, 255).astype(np.uint8), radius).astype(image.dtype)
+    return cv.medianBlur(image, radius)
@@ -2,33 +2,53 @@
 
 import json
 import os
-import random
-from typing import Dict, Iterable, List, Optional, Tuple
+import shutil
+import subprocess
+import tempfile
+import warnings
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import cv2 as cv
 import numpy as np
 import pytesseract as tesseract
-from PIL import Image
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 from .image_ops import (
     BoxBlurOperation,
+    CompositeNoiseOperation,
+    FusedAffineOperation,
     GaussianBlurOperation,
-    GaussianNoiseOperation,
     MaxFilterOperation,
     MinFilterOperation,
     ResizeOperation,
     RotateOperation,
-    SaltPepperOperation,
-    SpeckleOperation,
 )
+from .io_utils import JsonObjectWriter, read_image, write_png
 from .metrics import calculate_relative_edit_distance
-from .utils import scale_point2d, rotate_point2d_no_crop
+from .utils import rotate_points2d_no_crop
+
+
+def _iter_annotations(path: str) -> Iterator[Tuple[str, Dict]]:
+    """Yield (image name, annotation entry) pairs from JSON, in file order.
 
+    The file is parsed incrementally with ijson when it is installed, so only the current entry is held in
+    memory rather than the annotations of the whole dataset.
+    """
+    if ijson is not None:
+        with open(path, 'rb') as handle:
+            yield from ijson.kvitems(handle, '', use_float=True)
+        return
 
-def _load_annotations(path: str) -> Dict:
-    """Load annotation data from JSON."""
     with open(path, 'r', encoding='utf-8') as handle:
-        return json.load(handle)
+        annotations = json.load(handle)
+    yield from annotations.items()
 
 
 def _get_word_corners(word_data: Dict) -> List[Tuple[int, int]]:
@@ -52,56 +72,61 @@ def _get_word_corners(word_data: Dict) -> List[Tuple[int, int]]:
     return [(x1, y1), (x2, y1), (x2, y2), (x1, y2)]
 
 
-def _extract_image_text(annotations: Dict, image_name: str) -> str:
-    """Build the full text string from word annotations."""
-    result = ''
-    image_data = annotations[image_name]
+def _extract_image_text(image_data: Dict) -> str:
+    """Build the full text string from the word annotations of an image."""
+    parts = []
     words = image_data.get('words', image_data)
     for word_data in words:
         word = str(word_data.get('word', ''))
-        if '\n' not in word:
-            result += word + ' '
-        else:
-            result += word
-    result += '\f'
-    return result
+        parts.append(word if '\n' in word else word + ' ')
+    parts.append('\f')
+    return ''.join(parts)
 
 
 def _project_word_boxes(
-    annotations: Dict,
-    image_name: str,
+    image_data: Dict,
     source_size: Tuple[int, int],
     target_size: Tuple[int, int],
     angle: float,
 ) -> List[Dict]:
-    """Project word boxes into the degraded image space."""
-    word_boxes = []
-    target_width, target_height = target_size
-    image_data = annotations[image_name]
+    """Project word boxes into the degraded image space.
+
+    Corners of all words are stacked into one array, so the scale and the rotation about the target center
+    are applied with a couple of NumPy operations per image rather than per point.
+    """
     words_data = image_data.get('words', image_data)
+
+    words = []
+    corners = []
     for word_data in words_data:
-        word = word_data.get('word', '')
         source_corners = _get_word_corners(word_data)
-        if not source_corners:
-            continue
-
-        projected_corners = []
-        for point in source_corners:
-            scaled_point = scale_point2d(src_point=point, original_size=source_size, target_size=target_size)
-            new_point = rotate_point2d_no_crop(
-                src_point=scaled_point,
-                angle=angle,
-                center=(target_width // 2, target_height // 2),
-                img_size=target_size,
-            )
-            projected_corners.append(new_point)
+        if source_corners:
+            words.append(word_data.get('word', ''))
+            corners.append(source_corners)
+    if not words:
+        return []
+
+    source_width, source_height = source_size
+    target_width, target_height = target_size
 
-        xs = [p[0] for p in projected_corners]
-        ys = [p[1] for p in projected_corners]
+    counts = [len(word_corners) for word_corners in corners]
+    points = np.array([point for word_corners in corners for point in word_corners], dtype=np.float64)
+    points = np.rint(points * (target_width / source_width, target_height / source_height))
+
+    # same rotation RotateOperation warps the image with, applied to all corners at once
+    points = rotate_points2d_no_crop(points, angle, (target_width // 2, target_height // 2), target_size)
+
+    offsets = np.cumsum([0] + counts[:-1])
+    mins = np.minimum.reduceat(points, offsets, axis=0).tolist()
+    maxs = np.maximum.reduceat(points, offsets, axis=0).tolist()
+    projected = points.tolist()
+
+    word_boxes = []
+    for word, start, count, (min_x, min_y), (max_x, max_y) in zip(words, offsets.tolist(), counts, mins, maxs):
         word_boxes.append({
             'word': word,
-            'corners': projected_corners,
-            'bbox': [min(xs), min(ys), max(xs), max(ys)],
+            'corners': projected[start:start + count],
+            'bbox': [min_x, min_y, max_x, max_y],
         })
     return word_boxes
 
@@ -119,6 +144,14 @@ def _validate_degradation_config(
     salt_vs_pepper_max: float,
     salt_pepper_amount_min: float,
     salt_pepper_amount_max: float,
+    gaussian_blur_radius_min: int,
+    gaussian_blur_radius_max: int,
+    box_blur_radius_min: int,
+    box_blur_radius_max: int,
+    max_filter_radius_min: int,
+    max_filter_radius_max: int,
+    min_filter_radius_min: int,
+    min_filter_radius_max: int,
 ) -> None:
     if resize_min <= 0 or resize_max <= 0 or resize_min > resize_max:
         raise ValueError('Invalid resize range specified.')
@@ -132,15 +165,132 @@ def _validate_degradation_config(
         raise ValueError('Invalid salt-vs-pepper range specified.')
     if salt_pepper_amount_min > salt_pepper_amount_max or salt_pepper_amount_min < 0 or salt_pepper_amount_max < 0:
         raise ValueError('Invalid salt-pepper amount range specified.')
-
-
-def _pick_radius(min_value: int, max_value: int, step: int) -> int:
-    """Pick an integer radius from a range with a fixed step."""
+    if gaussian_blur_radius_min > gaussian_blur_radius_max:
+        raise ValueError('Invalid gaussian blur radius range specified.')
+    if box_blur_radius_min > box_blur_radius_max:
+        raise ValueError('Invalid box blur radius range specified.')
+    if max_filter_radius_min > max_filter_radius_max:
+        raise ValueError('Invalid max filter radius range specified.')
+    if min_filter_radius_min > min_filter_radius_max:
+        raise ValueError('Invalid min filter radius range specified.')
+
+
+def _run_tesseract_batch(image_paths: List[str], tesseract_cmd: Optional[str] = None) -> List[str]:
+    """Recognize a list of image files with a single tesseract process.
+
+    Tesseract accepts a text file listing images as its input and writes the text of all of them into one
+    output file, separating pages with a form feed, so the model is only loaded once per batch.
+    """
+    tesseract_cmd = tesseract_cmd or tesseract.pytesseract.tesseract_cmd
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        list_path = os.path.join(tmp_dir, 'images.txt')
+        with open(list_path, 'w', encoding='utf-8') as list_file:
+            list_file.write('\n'.join(os.path.abspath(path) for path in image_paths) + '\n')
+
+        output_base = os.path.join(tmp_dir, 'output')
+        try:
+            process = subprocess.run(
+                [tesseract_cmd, list_path, output_base, '--psm', '3'],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+        except FileNotFoundError:
+            raise tesseract.TesseractNotFoundError()
+        if process.returncode != 0:
+            raise tesseract.TesseractError(process.returncode, process.stderr.decode('utf-8', errors='replace'))
+
+        with open(output_base + '.txt', 'r', encoding='utf-8') as output_file:
+            output = output_file.read()
+
+    # tesseract 4 terminates every page with a form feed, tesseract 5 only separates them with one
+    if output.endswith('\f'):
+        output = output[:-1]
+    # each text ends with a form feed, like image_to_string output
+    texts = [page + '\f' for page in output.split('\f')]
+    if len(texts) != len(image_paths):
+        raise RuntimeError(f'Tesseract returned {len(texts)} pages for {len(image_paths)} images.')
+    return texts
+
+
+def _store_tesseract_results(recognized: List[Tuple[Dict, str]], recognition: Future) -> None:
+    """Store the tesseract output of a chunk of images, and its error against the reference text, in their entries.
+
+    A failed recognition is reported as a warning and leaves the tesseract fields of its entries at None, so
+    that it doesn't cost the annotations of the whole dataset; a missing tesseract binary is still raised.
+    """
+    try:
+        tesseract_texts = recognition.result()
+    except (tesseract.TesseractError, RuntimeError) as error:
+        warnings.warn(f'Tesseract failed on {len(recognized)} images, their tesseract output is left empty: {error}')
+        return
+
+    for (entry, real_text), tesseract_text in zip(recognized, tesseract_texts):
+        entry['tesseract_output'] = tesseract_text.split('\n') if tesseract_text else None
+        entry['tesseract_relative_error'] = int(calculate_relative_edit_distance(real_text, tesseract_text))
+
+
+def _write_batch(index: JsonObjectWriter, degraded: List[Tuple[str, Dict, Optional[str]]],
+                 recognitions: List[Tuple[List[Tuple[Dict, str]], Future]]) -> None:
+    """Wait for the tesseract runs of a batch and append its entries to the output annotations."""
+    for recognized, recognition in recognitions:
+        _store_tesseract_results(recognized, recognition)
+    for output_name, entry, _ in degraded:
+        index.write(output_name, entry)
+
+
+_INTERPOLATIONS = np.array([cv.INTER_AREA, cv.INTER_LINEAR, cv.INTER_CUBIC], dtype=np.int32)
+_PSNR_STRIDE = 4
+# images scheduled at a time, bounds how many annotation entries are held in memory
+_TASK_BATCH_SIZE = 512
+
+
+def _pick_radii(rng: np.random.Generator, min_value: int, max_value: int, step: int, count: int) -> np.ndarray:
+    """Pick `count` integer radii from a range with a fixed step."""
     if step <= 0:
         raise ValueError('Radius step must be a positive integer.')
     if min_value > max_value:
         raise ValueError('Invalid radius range specified.')
-    return random.randrange(min_value, max_value + 1, step)
+    return min_value + step * rng.integers(0, (max_value - min_value) // step + 1, count)
+
+
+def _draw_parameters(rng: np.random.Generator, count: int, config: Dict) -> List[Dict]:
+    """Draw the random degradation parameters of `count` images at once.
+
+    Returns one dict of plain Python scalars per image; parameters of disabled operations are omitted.
+    """
+    columns = {}
+    if config['use_resize']:
+        columns['resize_x'] = rng.uniform(config['resize_min'], config['resize_max'], count)
+        columns['resize_y'] = rng.uniform(config['resize_min'], config['resize_max'], count)
+        columns['interpolation'] = _INTERPOLATIONS[rng.integers(0, len(_INTERPOLATIONS), count)]
+    if config['use_gaussian_noise']:
+        columns['gaussian_mean'] = rng.uniform(config['gaussian_mean_min'], config['gaussian_mean_max'], count)
+        columns['gaussian_std'] = rng.uniform(config['gaussian_std_min'], config['gaussian_std_max'], count)
+    if config['use_salt_pepper']:
+        columns['salt_vs_pepper'] = rng.uniform(config['salt_vs_pepper_min'], config['salt_vs_pepper_max'], count)
+        columns['salt_pepper_amount'] = rng.uniform(
+            config['salt_pepper_amount_min'], config['salt_pepper_amount_max'], count
+        )
+    if config['use_gaussian_blur']:
+        columns['gaussian_blur_radius'] = _pick_radii(
+            rng, config['gaussian_blur_radius_min'], config['gaussian_blur_radius_max'], 2, count
+        )
+    if config['use_box_blur']:
+        columns['box_blur_radius'] = _pick_radii(
+            rng, config['box_blur_radius_min'], config['box_blur_radius_max'], 1, count
+        )
+    if config['use_max_filter']:
+        columns['max_filter_radius'] = _pick_radii(
+            rng, config['max_filter_radius_min'], config['max_filter_radius_max'], 2, count
+        )
+    if config['use_min_filter']:
+        columns['min_filter_radius'] = _pick_radii(
+            rng, config['min_filter_radius_min'], config['min_filter_radius_max'], 2, count
+        )
+    if config['use_rotate']:
+        columns['angle'] = rng.uniform(-config['max_rotate'], config['max_rotate'], count)
+
+    return [{name: values[idx].item() for name, values in columns.items()} for idx in range(count)]
 
 
 def _apply_operations(image: np.ndarray, operations: Iterable) -> np.ndarray:
@@ -151,6 +301,131 @@ def _apply_operations(image: np.ndarray, operations: Iterable) -> np.ndarray:
     return result
 
 
+def _to_uint8(image: np.ndarray) -> np.ndarray:
+    """Clip a float image to [0;255] in place and cast it to uint8; uint8 images are returned as they are."""
+    if image.dtype == np.uint8:
+        return image
+    np.clip(image, 0, 255, out=image)
+    return image.astype(np.uint8)
+
+
+def _process_one(task: Dict) -> Optional[Tuple[str, Dict]]:
+    """Degrade a single image, write it as PNG and return its output name and annotation entry.
+
+    Runs in a worker process, so everything it needs is carried by `task`: the image name and its
+    annotation entry, the per-image seed and the degradation parameters drawn for this image.
+    """
+    idx = task['index']
+    image_name = task['image_name']
+    params = task['params']
+
+    rng = np.random.default_rng(task['seed'])
+
+    source_image = read_image(os.path.join(task['images_dir'], image_name), grayscale=True)
+    if source_image is None:
+        return None
+
+    source_height, source_width = source_image.shape[:2]
+    source_size = (source_width, source_height)
+    if 'resize_x' in params:
+        target_width = max(1, int(source_width * params['resize_x']))
+        target_height = max(1, int(source_height * params['resize_y']))
+    else:
+        target_width = source_width
+        target_height = source_height
+    target_size = (target_width, target_height)
+
+    gaussian = None
+    if 'gaussian_mean' in params:
+        gaussian = (params['gaussian_mean'], params['gaussian_std'])
+    salt_pepper = None
+    if 'salt_vs_pepper' in params:
+        salt_pepper = (params['salt_vs_pepper'], params['salt_pepper_amount'])
+    speckle = task['speckle']
+
+    degradation_ops = []
+    if gaussian is not None or speckle or salt_pepper is not None:
+        degradation_ops.append(
+            CompositeNoiseOperation(gaussian=gaussian, speckle=speckle, salt_pepper=salt_pepper, rng=rng)
+        )
+    if 'gaussian_blur_radius' in params:
+        degradation_ops.append(GaussianBlurOperation(radius=params['gaussian_blur_radius']))
+    if 'box_blur_radius' in params:
+        degradation_ops.append(BoxBlurOperation(radius=params['box_blur_radius']))
+    if 'max_filter_radius' in params:
+        degradation_ops.append(MaxFilterOperation(radius=params['max_filter_radius']))
+    if 'min_filter_radius' in params:
+        degradation_ops.append(MinFilterOperation(radius=params['min_filter_radius']))
+
+    resize = None
+    if 'resize_x' in params:
+        resize = ResizeOperation(width=target_width, height=target_height, interpolation=params['interpolation'])
+    rotation = None
+    angle = 0.0
+    if 'angle' in params:
+        angle = params['angle']
+        rotation = RotateOperation(angle=angle, center=(target_width // 2, target_height // 2))
+
+    noised = source_image
+    if degradation_ops:
+        # noise, blurs and filters run on float32, so the image is cast back to uint8 only once at the end
+        noised = _apply_operations(source_image.astype(np.float32), degradation_ops)
+
+    # resize and rotation are done by one warp that resamples the image once; INTER_AREA averages source
+    # pixels, which a warp can't reproduce, so that resize stays separate
+    unrotated = None
+    degraded = noised
+    if resize is not None and rotation is not None and params['interpolation'] != cv.INTER_AREA:
+        warp = FusedAffineOperation([resize, rotation], interpolation=params['interpolation'])
+    else:
+        if resize is not None:
+            degraded = unrotated = resize(noised)
+        warp = rotation
+
+    if warp is not None:
+        degraded = warp(degraded)
+    degraded = _to_uint8(degraded)
+
+    psnr_value = None
+    if task['compute_psnr']:
+        # measured on the unrotated image, resized separately when the pixels went through the fused warp
+        if warp is None:
+            unrotated = degraded
+        elif unrotated is None:
+            unrotated = noised if resize is None else resize(noised)
+        unrotated = _to_uint8(unrotated)
+        if unrotated.shape != source_image.shape:
+            unrotated = ResizeOperation(
+                width=source_width,
+                height=source_height,
+                interpolation=cv.INTER_LINEAR,
+            )(unrotated)
+        # PSNR only depends on the mean squared error, which a uniform 4x4 subsample estimates well
+        psnr_value = float(cv.PSNR(source_image[::_PSNR_STRIDE, ::_PSNR_STRIDE],
+                                   unrotated[::_PSNR_STRIDE, ::_PSNR_STRIDE]))
+
+    output_name = f'degraded_{idx:05d}.png'
+    # encoded here, so PNG compression scales with the worker processes and only the entry goes back over IPC
+    write_png(os.path.join(task['output_images_dir'], output_name), degraded, compression=3)
+
+    word_boxes = _project_word_boxes(
+        image_data=task['annotation'],
+        source_size=source_size,
+        target_size=target_size,
+        angle=angle,
+    )
+
+    return output_name, {
+        'source_image': image_name,
+        'width': degraded.shape[1],
+        'height': degraded.shape[0],
+        'psnr': psnr_value,
+        'tesseract_output': None,
+        'tesseract_relative_error': None,
+        'words': word_boxes,
+    }
+
+
 def generate_degraded_dataset(
     images_dir: str,
     annotations_path: str,
@@ -191,12 +466,29 @@ def generate_degraded_dataset(
     min_filter_radius_max: int = 3,
     tesseract_cmd: Optional[str] = None,
     run_tesseract: bool = True,
+    num_workers: Optional[int] = None,
+    compute_psnr: bool = True,
 ) -> None:
-    """Generate degraded images and matching annotations from clear text images."""
+    """Generate degraded images and matching annotations from clear text images.
+
+    Images are processed independently in a pool of `num_workers` processes (defaults to the CPU count;
+    1 runs everything in the calling process). Each image gets its own seed derived from `seed`, so the
+    output is reproducible regardless of the number of workers.
+
+    Images are taken in the order of `annotations_path`, which is streamed in batches rather than loaded
+    at once; `num_images` counts only the annotated images that exist in `images_dir`. The output annotations
+    are written batch by batch as well, so memory use doesn't grow with the size of the dataset.
+
+    With `run_tesseract`, every batch is recognized by up to `num_workers` tesseract processes while the next
+    batch is degraded. A failed tesseract run is reported as a warning and leaves the tesseract fields of its
+    images empty, the annotations are written either way.
+    """
     if not os.path.isdir(images_dir):
         raise ValueError('Invalid images directory path specified.')
     if not os.path.isfile(annotations_path):
         raise ValueError('Invalid annotations path specified.')
+    if num_workers is not None and num_workers <= 0:
+        raise ValueError('num_workers must be a positive integer.')
     _validate_degradation_config(
         resize_min=resize_min,
         resize_max=resize_max,
@@ -210,132 +502,129 @@ def generate_degraded_dataset(
         salt_vs_pepper_max=salt_vs_pepper_max,
         salt_pepper_amount_min=salt_pepper_amount_min,
         salt_pepper_amount_max=salt_pepper_amount_max,
+        gaussian_blur_radius_min=gaussian_blur_radius_min,
+        gaussian_blur_radius_max=gaussian_blur_radius_max,
+        box_blur_radius_min=box_blur_radius_min,
+        box_blur_radius_max=box_blur_radius_max,
+        max_filter_radius_min=max_filter_radius_min,
+        max_filter_radius_max=max_filter_radius_max,
+        min_filter_radius_min=min_filter_radius_min,
+        min_filter_radius_max=min_filter_radius_max,
     )
+    if run_tesseract and shutil.which(tesseract_cmd or tesseract.pytesseract.tesseract_cmd) is None:
+        raise tesseract.TesseractNotFoundError()
 
     os.makedirs(output_dir, exist_ok=True)
     images_out_dir = os.path.join(output_dir, 'images')
     os.makedirs(images_out_dir, exist_ok=True)
 
-    if seed is not None:
-        random.seed(seed)
-        np.random.seed(seed)
-
-    if tesseract_cmd:
-        tesseract.pytesseract.tesseract_cmd = tesseract_cmd
-
-    annotation_data = _load_annotations(annotations_path)
-    image_filenames = sorted(annotation_data.keys())
+    config = {
+        'max_rotate': max_rotate,
+        'resize_min': resize_min,
+        'resize_max': resize_max,
+        'use_gaussian_noise': use_gaussian_noise,
+        'use_salt_pepper': use_salt_pepper,
+        'use_gaussian_blur': use_gaussian_blur,
+        'use_box_blur': use_box_blur,
+        'use_max_filter': use_max_filter,
+        'use_min_filter': use_min_filter,
+        'use_resize': use_resize,
+        'use_rotate': use_rotate,
+        'gaussian_mean_min': gaussian_mean_min,
+        'gaussian_mean_max': gaussian_mean_max,
+        'gaussian_std_min': gaussian_std_min,
+        'gaussian_std_max': gaussian_std_max,
+        'salt_vs_pepper_min': salt_vs_pepper_min,
+        'salt_vs_pepper_max': salt_vs_pepper_max,
+        'salt_pepper_amount_min': salt_pepper_amount_min,
+        'salt_pepper_amount_max': salt_pepper_amount_max,
+        'gaussian_blur_radius_min': gaussian_blur_radius_min,
+        'gaussian_blur_radius_max': gaussian_blur_radius_max,
+        'box_blur_radius_min': box_blur_radius_min,
+        'box_blur_radius_max': box_blur_radius_max,
+        'max_filter_radius_min': max_filter_radius_min,
+        'max_filter_radius_max': max_filter_radius_max,
+        'min_filter_radius_min': min_filter_radius_min,
+        'min_filter_radius_max': min_filter_radius_max,
+    }
+
+    # annotations are streamed, images without a readable file are skipped before they count towards num_images
+    entries = (
+        (image_name, image_data) for image_name, image_data in _iter_annotations(annotations_path)
+        if os.path.isfile(os.path.join(images_dir, image_name))
+    )
     if num_images is not None:
-        image_filenames = image_filenames[:num_images]
-
-    interpolations = [cv.INTER_AREA, cv.INTER_LINEAR, cv.INTER_CUBIC]
-    output_index = {}
-
-    for idx, image_name in enumerate(image_filenames):
-        image_path = os.path.join(images_dir, image_name)
-        if not os.path.isfile(image_path):
-            continue
-
-        source_image = cv.imread(image_path)
-        if source_image is None:
-            continue
-
-        source_height, source_width = source_image.shape[:2]
-        source_size = (source_width, source_height)
-        if use_resize:
-            target_width = max(1, int(source_width * random.uniform(resize_min, resize_max)))
-            target_height = max(1, int(source_height * random.uniform(resize_min, resize_max)))
-        else:
-            target_width = source_width
-            target_height = source_height
-        target_size = (target_width, target_height)
-
-        degradation_ops = []
-        if use_gaussian_noise:
-            degradation_ops.append(
-                GaussianNoiseOperation(
-                    mean=random.uniform(gaussian_mean_min, gaussian_mean_max),
-                    stddev=random.uniform(gaussian_std_min, gaussian_std_max),
-                )
-            )
-        if use_speckle:
-            degradation_ops.append(SpeckleOperation(mean=speckle_mean, stddev=speckle_std))
-            degradation_ops.append(SpeckleOperation(mean=speckle_mean_alt, stddev=speckle_std_alt))
-        if use_salt_pepper:
-            degradation_ops.append(
-                SaltPepperOperation(
-                    salt_vs_pepper=random.uniform(salt_vs_pepper_min, salt_vs_pepper_max),
-                    amount=random.uniform(salt_pepper_amount_min, salt_pepper_amount_max),
-                )
-            )
-        if use_gaussian_blur:
-            degradation_ops.append(GaussianBlurOperation(
-                radius=_pick_radius(gaussian_blur_radius_min, gaussian_blur_radius_max, 2)
-            ))
-        if use_box_blur:
-            degradation_ops.append(BoxBlurOperation(
-                radius=_pick_radius(box_blur_radius_min, box_blur_radius_max, 1)
-            ))
-        if use_max_filter:
-            degradation_ops.append(MaxFilterOperation(
-                radius=_pick_radius(max_filter_radius_min, max_filter_radius_max, 2)
-            ))
-        if use_min_filter:
-            degradation_ops.append(MinFilterOperation(
-                radius=_pick_radius(min_filter_radius_min, min_filter_radius_max, 2)
-            ))
-        if use_resize:
-            degradation_ops.append(
-                ResizeOperation(
-                    width=target_width,
-                    height=target_height,
-                    interpolation=interpolations[random.randint(0, 2)],
-                )
-            )
-
-        degraded_image = _apply_operations(source_image, degradation_ops) if degradation_ops else source_image
-        resized_to_source = ResizeOperation(
-            width=source_width,
-            height=source_height,
-            interpolation=cv.INTER_CUBIC,
-        )(degraded_image)
-        psnr_value = float(cv.PSNR(source_image, resized_to_source))
-
-        if use_rotate:
-            angle = random.uniform(-max_rotate, max_rotate)
-            degraded = RotateOperation(angle=angle, center=(target_width // 2, target_height // 2))(degraded_image)
-        else:
-            angle = 0.0
-            degraded = degraded_image
-        degraded_gray = cv.cvtColor(degraded, cv.COLOR_BGR2GRAY)
-
-        output_name = f'degraded_{idx:05d}.png'
-        Image.fromarray(np.uint8(degraded_gray)).save(os.path.join(images_out_dir, output_name))
-
-        tesseract_text = None
-        tesseract_relative_error = None
-        if run_tesseract:
-            real_text = _extract_image_text(annotation_data, image_name)
-            tesseract_text = tesseract.image_to_string(degraded_gray)
-            tesseract_relative_error = int(calculate_relative_edit_distance(real_text, tesseract_text))
-
-        word_boxes = _project_word_boxes(
-            annotations=annotation_data,
-            image_name=image_name,
-            source_size=source_size,
-            target_size=target_size,
-            angle=angle,
-        )
-
-        output_index[output_name] = {
-            'source_image': image_name,
-            'width': degraded_gray.shape[1],
-            'height': degraded_gray.shape[0],
-            'psnr': psnr_value,
-            'tesseract_output': (tesseract_text.split('\n') if tesseract_text else None),
-            'tesseract_relative_error': tesseract_relative_error,
-            'words': word_boxes,
-        }
-
-    with open(os.path.join(output_dir, 'annotations.json'), 'w', encoding='utf-8') as write_file:
-        json.dump(output_index, write_file, indent=4)
+        entries = islice(entries, num_images)
+
+    # the parameters and the images get independent streams: one child sequence draws the parameters,
+    # the other spawns one sequence per image, in image order whatever the number of workers
+    parameters_seed, images_seed = np.random.SeedSequence(seed).spawn(2)
+    rng = np.random.default_rng(parameters_seed)
+    speckle = [(speckle_mean, speckle_std), (speckle_mean_alt, speckle_std_alt)] if use_speckle else []
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    # the degraded entries of a batch and its tesseract runs, written out once the next batch is under way
+    pending = None
+    with ExitStack() as stack:
+        index = stack.enter_context(JsonObjectWriter(os.path.join(output_dir, 'annotations.json')))
+        executor = None
+        ocr_pool = stack.enter_context(ThreadPoolExecutor(max_workers=num_workers)) if run_tesseract else None
+        num_scheduled = 0
+        while True:
+            batch = list(islice(entries, _TASK_BATCH_SIZE))
+            if not batch:
+                break
+
+            parameters = _draw_parameters(rng, len(batch), config)
+            image_seeds = images_seed.spawn(len(batch))
+            tasks = []
+            for offset, (image_name, image_data) in enumerate(batch):
+                idx = num_scheduled + offset
+                tasks.append({
+                    'index': idx,
+                    'image_name': image_name,
+                    'annotation': image_data,
+                    'images_dir': images_dir,
+                    'output_images_dir': images_out_dir,
+                    'seed': image_seeds[offset],
+                    'params': parameters[offset],
+                    'speckle': speckle,
+                    'compute_psnr': compute_psnr,
+                })
+            num_scheduled += len(batch)
+
+            if num_workers == 1 or (executor is None and len(tasks) <= 1):
+                results = map(_process_one, tasks)
+            else:
+                if executor is None:
+                    executor = stack.enter_context(ProcessPoolExecutor(max_workers=min(num_workers, len(tasks))))
+                results = executor.map(_process_one, tasks, chunksize=8)
+
+            degraded = []
+            for task, result in zip(tasks, results):
+                if result is not None:
+                    output_name, entry = result
+                    real_text = _extract_image_text(task['annotation']) if run_tesseract else None
+                    degraded.append((output_name, entry, real_text))
+
+            recognitions = []
+            if run_tesseract and degraded:
+                # one tesseract process per worker and batch, recognizing while the next batch is degraded
+                chunk_size = -(-len(degraded) // num_workers)
+                for start in range(0, len(degraded), chunk_size):
+                    chunk = degraded[start:start + chunk_size]
+                    recognition = ocr_pool.submit(
+                        _run_tesseract_batch,
+                        [os.path.join(images_out_dir, output_name) for output_name, _, _ in chunk],
+                        tesseract_cmd=tesseract_cmd,
+                    )
+                    recognitions.append(([(entry, real_text) for _, entry, real_text in chunk], recognition))
+
+            if pending is not None:
+                _write_batch(index, *pending)
+            pending = degraded, recognitions
+
+        if pending is not None:
+            _write_batch(index, *pending)
@@ -1,12 +1,13 @@
 """Utilities for downscaling image datasets."""
 
-import glob
 import os
 from typing import Optional, Tuple
 
 import cv2
 from PIL import Image
 
+from .io_utils import list_files
+
 
 def _get_interpolation_key(interpolation: str) -> int:
     if interpolation == 'nearest':
@@ -41,7 +42,7 @@ def generate_downscaled_images(
         os.makedirs(output_dir, exist_ok=True)
     
     inter_key = _get_interpolation_key(interpolation)
-    for fp in glob.glob(os.path.join(images_dir, '*.*')):
+    for fp in list_files(images_dir):
         try:
             raw = cv2.imread(fp)
             if raw is None:
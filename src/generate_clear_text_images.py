@@ -1,12 +1,18 @@
 """Utilities for generating clear text images with annotations."""
 
-import json
 import os
-import random
-from typing import Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
+from .io_utils import write_json, write_png
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
 
 def _resolve_font(font_path: Optional[str], font_size: int) -> ImageFont.ImageFont:
     """Return a PIL font instance, falling back to common system fonts."""
@@ -37,6 +43,84 @@ def _text_size(font: ImageFont.ImageFont, text: str) -> Tuple[int, int]:
     return font.getsize(text)
 
 
+def _build_glyph_atlas(font: ImageFont.ImageFont, characters: str) -> Tuple[Dict[str, int], np.ndarray, np.ndarray]:
+    """Rasterize every character once.
+
+    Returns the glyph index of each character, the flattened tiles of all glyphs (black ink on white,
+    row-major) and a (num_glyphs, 5) table with the start of each tile in that buffer followed by its
+    left/top offset from the text origin and its width/height.
+    """
+    glyph_ids = {}
+    tiles = []
+    glyph_info = []
+    start = 0
+    for character in sorted(set(characters)):
+        left, top, right, bottom = font.getbbox(character)
+        glyph_width, glyph_height = max(0, right - left), max(0, bottom - top)
+        coverage = Image.new(mode='L', size=(max(1, glyph_width), max(1, glyph_height)), color=0)
+        ImageDraw.Draw(coverage).text((-left, -top), character, 255, font=font)
+        tile = 255 - np.asarray(coverage)[:glyph_height, :glyph_width]
+
+        glyph_ids[character] = len(glyph_info)
+        glyph_info.append((start, left, top, glyph_width, glyph_height))
+        tiles.append(tile.ravel())
+        start += tile.size
+
+    return glyph_ids, np.concatenate(tiles).astype(np.uint8), np.array(glyph_info, dtype=np.int32)
+
+
+def _layout_word(font: ImageFont.ImageFont, word: str, glyph_ids: Dict[str, int]) -> List[Tuple[int, int]]:
+    """Return (pen offset, glyph index) of every character of a word, using the font advances."""
+    layout = []
+    pen = 0.0
+    for character in word:
+        layout.append((round(pen), glyph_ids[character]))
+        pen += font.getlength(character)
+    return layout
+
+
+def _blit_glyphs_numpy(canvas: np.ndarray, tiles: np.ndarray, glyph_info: np.ndarray,
+                       xs: np.ndarray, ys: np.ndarray, ids: np.ndarray) -> None:
+    """Darken the canvas with glyph tiles placed at the given text origins (NumPy fallback)."""
+    height, width = canvas.shape
+    for x, y, glyph_id in zip(xs.tolist(), ys.tolist(), ids.tolist()):
+        start, left, top, glyph_width, glyph_height = glyph_info[glyph_id].tolist()
+        tile = tiles[start:start + glyph_width * glyph_height].reshape(glyph_height, glyph_width)
+        x0, y0 = x + left, y + top
+        x1, y1 = max(x0, 0), max(y0, 0)
+        x2, y2 = min(x0 + glyph_width, width), min(y0 + glyph_height, height)
+        if x1 >= x2 or y1 >= y2:
+            continue
+        region = canvas[y1:y2, x1:x2]
+        np.minimum(region, tile[y1 - y0:y2 - y0, x1 - x0:x2 - x0], out=region)
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _blit_glyphs(canvas, tiles, glyph_info, xs, ys, ids):
+        """Darken the canvas with glyph tiles placed at the given text origins.
+
+        Single threaded on purpose: encoding the PNGs dominates, and numba's thread pools don't survive the
+        fork of the process pools that usually follow (e.g. in degrade_dataset).
+        """
+        height, width = canvas.shape
+        for row in range(height):
+            for i in range(ids.shape[0]):
+                glyph_id = ids[i]
+                glyph_row = row - ys[i] - glyph_info[glyph_id, 2]
+                glyph_width = glyph_info[glyph_id, 3]
+                if glyph_row < 0 or glyph_row >= glyph_info[glyph_id, 4]:
+                    continue
+                offset = glyph_info[glyph_id, 0] + glyph_row * glyph_width
+                x0 = xs[i] + glyph_info[glyph_id, 1]
+                for col in range(glyph_width):
+                    x = x0 + col
+                    if 0 <= x < width and tiles[offset + col] < canvas[row, x]:
+                        canvas[row, x] = tiles[offset + col]
+else:
+    _blit_glyphs = _blit_glyphs_numpy
+
+
 def generate_clear_text_images(
     text_file_path: str,
     output_dir: str,
@@ -72,12 +156,19 @@ def generate_clear_text_images(
         raise ValueError('Text file is empty or contains no words.')
 
     space_width, _ = _text_size(font, ' ')
+    # every glyph is rasterized once, images are then assembled by copying glyph tiles into the canvas
+    glyph_ids, tiles, glyph_info = _build_glyph_atlas(font, ''.join(words))
+    # words repeat a lot in natural text, so measure and lay out each distinct word only once
+    word_sizes = {}
+    word_layouts = {}
     annotations = {}
     word_index = 0
 
     for i in range(num_images):
-        img = Image.new(mode='RGB', size=(width, height), color=(255, 255, 255))
-        draw = ImageDraw.Draw(img)
+        canvas = np.full((height, width), 255, dtype=np.uint8)
+        glyph_xs = []
+        glyph_ys = []
+        glyph_indices = []
 
         cursor_x = border_margin
         cursor_y = border_margin
@@ -88,7 +179,11 @@ def generate_clear_text_images(
                 word_index = 0
 
             word = words[word_index]
-            word_width, word_height = _text_size(font, word)
+            word_size = word_sizes.get(word)
+            if word_size is None:
+                word_size = word_sizes[word] = _text_size(font, word)
+                word_layouts[word] = _layout_word(font, word, glyph_ids)
+            word_width, word_height = word_size
 
             if cursor_x + word_width + border_margin > width:
                 cursor_x = border_margin
@@ -98,7 +193,10 @@ def generate_clear_text_images(
                 can_place_text = False
                 break
 
-            draw.text((cursor_x, cursor_y), word, (0, 0, 0), font=font)
+            for pen, glyph_id in word_layouts[word]:
+                glyph_xs.append(cursor_x + pen)
+                glyph_ys.append(cursor_y)
+                glyph_indices.append(glyph_id)
             x1, y1 = cursor_x, cursor_y
             x2, y2 = cursor_x + word_width, cursor_y + word_height
             word_annotations.append({
@@ -109,13 +207,15 @@ def generate_clear_text_images(
             cursor_x += word_width + space_width
             word_index += 1
 
+        _blit_glyphs(canvas, tiles, glyph_info, np.array(glyph_xs, dtype=np.int32),
+                     np.array(glyph_ys, dtype=np.int32), np.array(glyph_indices, dtype=np.int32))
+
         file_name = f'clear_image_{i:05d}.png'
-        img.save(os.path.join(images_dir, file_name))
+        write_png(os.path.join(images_dir, file_name), canvas)
         annotations[file_name] = {
             'width': width,
             'height': height,
             'words': word_annotations,
         }
 
-    with open(os.path.join(output_dir, 'annotations.json'), 'w', encoding='utf-8') as write_file:
-        json.dump(annotations, write_file, indent=4)
+    write_json(os.path.join(output_dir, 'annotations.json'), annotations)
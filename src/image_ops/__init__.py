@@ -2,10 +2,12 @@ from .gauss import GaussianNoiseOperation
 from .poisson import PoissonNoiseOperation
 from .salt_pepper import SaltPepperOperation
 from .speckle import SpeckleOperation
+from .composite_noise import CompositeNoiseOperation
 from .resize import ResizeOperation
 from .scale import ScaleOperation
 from .translate import TranslateOperation
 from .rotate import RotateOperation
+from .fused_affine import FusedAffineOperation
 from .gaussian_blur import GaussianBlurOperation
 from .box_blur import BoxBlurOperation
 from .min_filter import MinFilterOperation
@@ -14,6 +16,7 @@ from .median_filter import MedianFilterOperation
 
 
 __all__ = ['GaussianNoiseOperation', 'PoissonNoiseOperation', 'SaltPepperOperation', 'SpeckleOperation',
-           'ResizeOperation', 'ScaleOperation', 'TranslateOperation', 'RotateOperation',
+           'CompositeNoiseOperation',
+           'ResizeOperation', 'ScaleOperation', 'TranslateOperation', 'RotateOperation', 'FusedAffineOperation',
            'GaussianBlurOperation', 'BoxBlurOperation', 'MinFilterOperation', 'MaxFilterOperation',
            'MedianFilterOperation']
@@ -1,10 +1,15 @@
-from .base import BaseImageOperation
+from .base import AffineImageOperation
 from ..transformations import affine_transform
+import cv2 as cv
 
 
-class AffineTransformOperation(BaseImageOperation):
+class AffineTransformOperation(AffineImageOperation):
     """
     Class that implements affine transformation operation of an image
     """
     def __init__(self, pts1, pts2):
-        self._op = lambda X: affine_transform(X, pts1, pts2)
+        self._matrix = cv.getAffineTransform(pts1, pts2)
+        super().__init__(lambda X: affine_transform(X, pts1, pts2))
+
+    def affine(self, size):
+        return self._matrix, size
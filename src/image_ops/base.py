@@ -1,5 +1,5 @@
-from abc import ABC
-from typing import Callable, Optional
+from abc import ABC, abstractmethod
+from typing import Callable, Tuple
 
 import numpy as np
 
@@ -9,16 +9,24 @@ class BaseImageOperation(ABC):
     Base class for all image operations. Provides an interface for successor classes. 
     """
     
-    _op: Optional[Callable[[np.ndarray], np.ndarray]] = None
+    def __init__(self, op: Callable[[np.ndarray], np.ndarray]):
+        self._op = op
+        # the instance attribute shadows the method below, so `process` calls go straight to the operation
+        self.process = op
 
     def process(self, image: np.ndarray) -> np.ndarray:
-        if not self._op:
-            raise NotImplementedError
-        
         return self._op(image)
 
     def __call__(self, image: np.ndarray, *args, **kwargs) -> np.ndarray:
-        if not self._op:
-            raise NotImplementedError
-        
         return self._op(image)
+
+
+class AffineImageOperation(BaseImageOperation):
+    """
+    Base class for geometric operations that are an affine transform of an image. Chains of such operations
+    can be applied with a single warp (see FusedAffineOperation).
+    """
+
+    @abstractmethod
+    def affine(self, size: Tuple[int, int]) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """Return the 2x3 matrix of the operation for an image of the given (width, height) and the output size."""
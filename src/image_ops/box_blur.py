@@ -7,5 +7,5 @@ class BoxBlurOperation(BaseImageOperation):
     Class that implements operation of adding box blur to an image.
     """
     def __init__(self, radius=1):
-        self._op = lambda X: box_blur(X, radius)
+        super().__init__(lambda X: box_blur(X, radius))
 
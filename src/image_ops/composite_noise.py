@@ -0,0 +1,11 @@
+from .base import BaseImageOperation
+from ..noise import composite_noise
+
+
+class CompositeNoiseOperation(BaseImageOperation):
+    """
+    Class that implements operation of adding gaussian, speckle and salt and pepper noise to an image in one pass.
+    """
+    def __init__(self, gaussian=None, speckle=(), salt_pepper=None, rng=None):
+        super().__init__(lambda X: composite_noise(X, gaussian=gaussian, speckle=speckle,
+                                                   salt_pepper=salt_pepper, rng=rng))
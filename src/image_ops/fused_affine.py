@@ -0,0 +1,24 @@
+from .base import AffineImageOperation
+from ..transformations import compose_affine, fused_affine
+import cv2 as cv
+
+
+class FusedAffineOperation(AffineImageOperation):
+    """
+    Class that implements a chain of affine operations (resize, rotate, ...) as a single warp of an image
+    """
+    def __init__(self, operations, interpolation=cv.INTER_LINEAR, border_value: int = 255):
+        self._operations = list(operations)
+        super().__init__(lambda X: fused_affine(X, *self._chain((X.shape[1], X.shape[0])),
+                                                interpolation=interpolation, border_value=border_value))
+
+    def _chain(self, size):
+        matrices = []
+        for operation in self._operations:
+            M, size = operation.affine(size)
+            matrices.append(M)
+        return matrices, size
+
+    def affine(self, size):
+        matrices, size = self._chain(size)
+        return compose_affine(matrices), size
@@ -7,5 +7,5 @@ class GaussianBlurOperation(BaseImageOperation):
     Class that implements operation of adding gaussian blur to an image.
     """
     def __init__(self, radius=1):
-        self._op = lambda X: gaussian_blur(X, radius)
+        super().__init__(lambda X: gaussian_blur(X, radius))
 
@@ -7,5 +7,5 @@ class MaxFilterOperation(BaseImageOperation):
     Class that implements operation of adding max filter to an image.
     """
     def __init__(self, radius=3):
-        self._op = lambda X: max_filter(X, radius)
+        super().__init__(lambda X: max_filter(X, radius))
 
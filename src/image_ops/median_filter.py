@@ -7,5 +7,5 @@ class MedianFilterOperation(BaseImageOperation):
     Class that implements operation of adding median filter to an image.
     """
     def __init__(self, radius=3):
-        self._op = lambda X: median_filter(X, radius)
+        super().__init__(lambda X: median_filter(X, radius))
 
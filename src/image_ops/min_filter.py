@@ -7,5 +7,5 @@ class MinFilterOperation(BaseImageOperation):
     Class that implements operation of adding min filter to an image.
     """
     def __init__(self, radius=3):
-        self._op = lambda X: min_filter(X, radius)
+        super().__init__(lambda X: min_filter(X, radius))
 
@@ -6,5 +6,5 @@ class PoissonNoiseOperation(BaseImageOperation):
     """
     Class that implements operation of adding poisson noise to an image.
     """
-    def __init__(self):
-        self._op = lambda X: noisify(X, noise_type=NoiseTypes.POISSON)
+    def __init__(self, rng=None):
+        super().__init__(lambda X: noisify(X, noise_type=NoiseTypes.POISSON, rng=rng))
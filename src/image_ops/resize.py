@@ -1,11 +1,15 @@
-from .base import BaseImageOperation
-from ..transformations import resize
+from .base import AffineImageOperation
+from ..transformations import resize, resize_matrix
 import cv2 as cv
 
 
-class ResizeOperation(BaseImageOperation):
+class ResizeOperation(AffineImageOperation):
     """
     Class that implements operation of resizing an image
     """
     def __init__(self, width, height, interpolation=cv.INTER_LINEAR):
-        self._op = lambda X: resize(X, width, height, interpolation)
+        self._size = (width, height)
+        super().__init__(lambda X: resize(X, width, height, interpolation))
+
+    def affine(self, size):
+        return resize_matrix(size, self._size), self._size
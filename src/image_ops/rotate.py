@@ -1,10 +1,15 @@
-from .base import BaseImageOperation
-from ..transformations import rotate
+from .base import AffineImageOperation
+from ..transformations import rotate, rotation_matrix
 
 
-class RotateOperation(BaseImageOperation):
+class RotateOperation(AffineImageOperation):
     """
     Class that implements operation of rotating an image
     """
     def __init__(self, angle, center: (int, int), border_value: int = 255):
-        self._op = lambda X: rotate(X, angle, center, border_value=border_value)
+        self._angle = angle
+        self._center = center
+        super().__init__(lambda X: rotate(X, angle, center, border_value=border_value))
+
+    def affine(self, size):
+        return rotation_matrix(self._angle, self._center, size)
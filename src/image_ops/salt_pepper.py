@@ -1,11 +1,10 @@
 from .base import BaseImageOperation
-from ..noise import NoiseTypes, noisify
+from ..noise import salt_pepper_noise
 
 
 class SaltPepperOperation(BaseImageOperation):
     """
     Class that implements operation of adding salt and pepper noise to an image.
     """
-    def __init__(self, salt_vs_pepper=0.5, amount=0.01):
-        self._op = lambda X: noisify(X, noise_type=NoiseTypes.SALT_AND_PEPPER,                  
-                                     salt_vs_pepper=salt_vs_pepper, amount=amount)
+    def __init__(self, salt_vs_pepper=0.5, amount=0.01, rng=None):
+        super().__init__(lambda X: salt_pepper_noise(X, salt_vs_pepper=salt_vs_pepper, amount=amount, rng=rng))
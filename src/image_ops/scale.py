@@ -1,10 +1,14 @@
-from .base import BaseImageOperation
-from ..transformations import scale
+from .base import AffineImageOperation
+from ..transformations import scale, scale_matrix
 
 
-class ScaleOperation(BaseImageOperation):
+class ScaleOperation(AffineImageOperation):
     """
     Class that implements operation of scaling an image
     """
     def __init__(self, kwidth, kheight, center: (int, int)):
-        self._op = lambda X: scale(X, kwidth, kheight, center)
+        self._matrix = scale_matrix(kwidth, kheight, center)
+        super().__init__(lambda X: scale(X, kwidth, kheight, center))
+
+    def affine(self, size):
+        return self._matrix, size
@@ -1,10 +1,14 @@
-from .base import BaseImageOperation
-from ..transformations import translate
+from .base import AffineImageOperation
+from ..transformations import translate, translation_matrix
 
 
-class TranslateOperation(BaseImageOperation):
+class TranslateOperation(AffineImageOperation):
     """
     Class that implements operation of translating an image
     """
     def __init__(self, twidth, theight):
-        self._op = lambda X: translate(X, twidth, theight)
+        self._matrix = translation_matrix(twidth, theight)
+        super().__init__(lambda X: translate(X, twidth, theight))
+
+    def affine(self, size):
+        return self._matrix, size
@@ -0,0 +1,158 @@
+"""File I/O helpers for images and annotations."""
+
+import io
+import json
+import os
+from typing import Any, List, Optional
+
+import cv2 as cv
+import numpy as np
+from PIL import Image, ImageOps
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from turbojpeg import TJPF_BGR, TJPF_GRAY, TurboJPEG
+except ImportError:
+    TurboJPEG = None
+
+
+_JPEG_EXTENSIONS = ('.jpg', '.jpeg')
+_EXIF_ORIENTATION = 0x0112
+_turbo_jpeg = None
+
+
+def _get_turbo_jpeg() -> Optional['TurboJPEG']:
+    """Return a shared TurboJPEG decoder, or None if PyTurboJPEG or libturbojpeg is unavailable."""
+    global _turbo_jpeg
+    if _turbo_jpeg is None and TurboJPEG is not None:
+        try:
+            _turbo_jpeg = TurboJPEG()
+        except (OSError, RuntimeError):
+            # the Python package is there but the shared library isn't, don't try again
+            _turbo_jpeg = False
+    return _turbo_jpeg or None
+
+
+def list_files(directory: str) -> List[str]:
+    """Return paths of the files in a directory whose names have an extension, like `glob('*.*')`.
+
+    Uses a single `os.scandir` pass, whose entries already know whether they are regular files.
+    """
+    with os.scandir(directory) as entries:
+        return [
+            entry.path for entry in entries
+            if '.' in entry.name and not entry.name.startswith('.') and entry.is_file()
+        ]
+
+
+def _exif_orientation(data: bytes) -> int:
+    """Return the EXIF orientation of an encoded image, 1 (upright) when it has none; only the header is parsed."""
+    with Image.open(io.BytesIO(data)) as image:
+        return image.getexif().get(_EXIF_ORIENTATION, 1)
+
+
+def read_image(path: str, grayscale: bool = False) -> Optional[np.ndarray]:
+    """Read an image as a BGR (or single-channel, if `grayscale`) uint8 array.
+
+    Returns None if the file can't be decoded, like `cv.imread`. JPEGs are decoded with libjpeg-turbo when
+    PyTurboJPEG is installed, everything else goes through Pillow (or Pillow-SIMD, when that is the installed
+    flavour). The EXIF orientation is applied like `cv.imread` does, so JPEGs tagged with one are left to
+    Pillow, as libjpeg-turbo ignores it.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        if extension in _JPEG_EXTENSIONS:
+            turbo_jpeg = _get_turbo_jpeg()
+            if turbo_jpeg is not None and _exif_orientation(data) == 1:
+                if grayscale:
+                    return turbo_jpeg.decode(data, pixel_format=TJPF_GRAY)[:, :, 0]
+                return turbo_jpeg.decode(data, pixel_format=TJPF_BGR)
+
+        with Image.open(io.BytesIO(data)) as image:
+            upright = ImageOps.exif_transpose(image)
+            decoded = np.asarray(upright.convert('L' if grayscale else 'RGB'))
+    except OSError:
+        return None
+    return decoded if grayscale else cv.cvtColor(decoded, cv.COLOR_RGB2BGR)
+
+
+def write_json(path: str, data: Any) -> None:
+    """Write data as an indented JSON document, serialized with orjson when it is installed."""
+    if orjson is not None:
+        with open(path, 'wb') as handle:
+            handle.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
+
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(data, handle, indent=2)
+
+
+class JsonObjectWriter:
+    """Write a JSON object member by member, so the values don't all have to be held in memory.
+
+    The document is laid out like `write_json` output. It is written to a temporary file next to `path`, which
+    replaces `path` only when the writer is closed without an error; on an error it is deleted, so an
+    interrupted run doesn't leave a truncated document behind.
+    """
+
+    def __init__(self, path: str):
+        self._path = path
+        self._partial_path = path + '.part'
+        self._handle = open(self._partial_path, 'wb')
+        self._empty = True
+
+    def write(self, key: str, value: Any) -> None:
+        if orjson is not None:
+            encoded = orjson.dumps(key) + b': ' + orjson.dumps(value, option=orjson.OPT_INDENT_2)
+        else:
+            encoded = (json.dumps(key) + ': ' + json.dumps(value, indent=2)).encode('utf-8')
+        # newlines only appear between JSON tokens (they are escaped inside strings), so this nests the value
+        self._handle.write((b'{\n  ' if self._empty else b',\n  ') + encoded.replace(b'\n', b'\n  '))
+        self._empty = False
+
+    def close(self) -> None:
+        self._handle.write(b'{}' if self._empty else b'\n}')
+        self._handle.close()
+        os.replace(self._partial_path, self._path)
+
+    def discard(self) -> None:
+        """Close the writer and delete what was written, leaving `path` untouched."""
+        self._handle.close()
+        try:
+            os.remove(self._partial_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'JsonObjectWriter':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+
+
+def write_jpeg(path: str, image: np.ndarray, quality: int = 90) -> None:
+    """Encode an image as JPEG in memory and write the bytes with a single buffered write."""
+    ok, encoded = cv.imencode('.jpg', image, [cv.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        raise ValueError(f'Unable to encode image: {path}')
+    with open(path, 'wb') as handle:
+        handle.write(encoded)
+
+
+def write_png(path: str, image: np.ndarray, compression: int = 3) -> None:
+    """Encode and write an image as PNG.
+
+    zlib level 3 encodes roughly twice as fast as OpenCV's default level while producing files only slightly
+    larger, which matters when writing whole datasets.
+    """
+    if not cv.imwrite(path, image, [cv.IMWRITE_PNG_COMPRESSION, compression]):
+        raise ValueError(f'Unable to write image: {path}')
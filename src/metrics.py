@@ -1,26 +1,75 @@
-import numpy as np
+from functools import lru_cache
+
+try:
+    from rapidfuzz.distance import Levenshtein
+except ImportError:
+    Levenshtein = None
+
+# up to this length of the shorter string the compiled quadratic DP beats the bit-parallel loop in Python
+_NUMBA_MAX_PATTERN_LENGTH = 256
+
+
+def _bit_parallel_edit_distance(pattern: str, text: str) -> int:
+    """Levenshtein distance with the Myers/Hyyrö bit-parallel algorithm.
+
+    A whole column of the DP matrix is packed into the bits of an integer, so every character of `text`
+    costs a handful of bitwise operations instead of `len(pattern)` cell updates. Python integers are
+    arbitrary precision, so patterns longer than a machine word are handled as multi-word blocks implicitly.
+    """
+    if not pattern:
+        return len(text)
+
+    peq = {}
+    for i, character in enumerate(pattern):
+        peq[character] = peq.get(character, 0) | (1 << i)
+
+    mask = (1 << len(pattern)) - 1
+    last_bit = 1 << (len(pattern) - 1)
+    vp = mask
+    vn = 0
+    score = len(pattern)
+    for character in text:
+        x = peq.get(character, 0) | vn
+        d0 = (((x & vp) + vp) ^ vp) | x
+        hp = (vn | ~(d0 | vp)) & mask
+        hn = vp & d0
+        if hp & last_bit:
+            score += 1
+        elif hn & last_bit:
+            score -= 1
+        hp = (hp << 1) | 1
+        hn = hn << 1
+        vp = (hn | ~(d0 | hp)) & mask
+        vn = hp & d0 & mask
+    return score
+
+
+@lru_cache(maxsize=1)
+def _numba_edit_distance():
+    """Return the numba edit distance, or None without numba; imported on first use, as numba is slow to import
+    and most runs (rapidfuzz installed, or no tesseract) never need it."""
+    try:
+        from ._metrics_numba import edit_distance
+    except ImportError:
+        return None
+    return edit_distance
 
 
 def calculate_edit_distance(ground_truth_text: str, predicted_text: str) -> int:
     """Calculate Levenshtein edit distance between two strings."""
-    rows = len(ground_truth_text) + 1
-    cols = len(predicted_text) + 1
-    distance_mat = np.zeros((rows, cols), dtype=int)
-
-    distance_mat[:, 0] = np.arange(rows)
-    distance_mat[0, :] = np.arange(cols)
-
-    for i in range(1, rows):
-        for j in range(1, cols):
-            if ground_truth_text[i - 1] == predicted_text[j - 1]:
-                distance_mat[i, j] = distance_mat[i - 1, j - 1]
-            else:
-                insert_cost = distance_mat[i, j - 1]
-                delete_cost = distance_mat[i - 1, j]
-                replace_cost = distance_mat[i - 1, j - 1]
-                distance_mat[i, j] = min(insert_cost, delete_cost, replace_cost) + 1
-
-    return int(distance_mat[rows - 1, cols - 1])
+    if Levenshtein is not None:
+        return Levenshtein.distance(ground_truth_text, predicted_text)
+
+    # the distance is symmetric, the shorter string as the pattern keeps the bit vectors / DP rows small
+    pattern, text = ground_truth_text, predicted_text
+    if len(text) < len(pattern):
+        pattern, text = text, pattern
+
+    if len(pattern) <= _NUMBA_MAX_PATTERN_LENGTH:
+        numba_edit_distance = _numba_edit_distance()
+        if numba_edit_distance is not None:
+            return numba_edit_distance(text, pattern)
+    return _bit_parallel_edit_distance(pattern, text)
 
 
 def calculate_relative_edit_distance(ground_truth_text: str, predicted_text: str) -> float:
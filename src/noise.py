@@ -1,10 +1,84 @@
 """Noise generation utilities."""
 
+import math
+import os
+import threading
+from collections import OrderedDict
 from enum import Enum
-from typing import Any
+from typing import Any, Optional, Sequence, Tuple
 
 import numpy as np
-from numpy.random import randint
+
+# seeding a generator from OS entropy costs more than drawing the noise of a small image, so calls without
+# an explicit generator reuse one per thread; per thread, so that threads don't contend for its lock
+_thread_state = threading.local()
+
+
+def _default_rng() -> np.random.Generator:
+    """Return the default generator of the calling thread, created on first use."""
+    rng = getattr(_thread_state, 'rng', None)
+    if rng is None:
+        rng = _thread_state.rng = np.random.default_rng()
+    return rng
+
+
+def _reset_default_rngs() -> None:
+    global _thread_state
+    _thread_state = threading.local()
+
+
+if hasattr(os, 'register_at_fork'):
+    # forked workers would otherwise all continue the parent's random stream
+    os.register_at_fork(after_in_child=_reset_default_rngs)
+
+
+# uint8 images with moderate gaussian noise take an integer path: noise values come from a table of 2**16
+# equally likely slots, indexed by random uint16 draws
+_GAUSSIAN_LUT_SIZE = 1 << 16
+_GAUSSIAN_LUT_MAX_STDDEV = 40.0
+_GAUSSIAN_LUT_CACHE_SIZE = 64
+# (mean, stddev) -> table, or None for parameters seen only once so far; least recently used first
+_gaussian_luts = OrderedDict()
+_gaussian_luts_lock = threading.Lock()
+
+
+def _build_gaussian_lut(mean: float, stddev: float) -> np.ndarray:
+    """Return the int16 table of floor(N(mean, stddev)) values, each repeated in proportion to its probability.
+
+    The noise is rounded down, so adding it to an integer pixel gives the same value as truncating the pixel
+    plus the exact noise, like the float path does. Probabilities are quantized to 2**-16: a value gets no
+    slot when its probability is below about 2**-17 and its mass goes to the nearest value that has one,
+    which truncates the noise at about +-4.4 stddev (e.g. -44..43 for stddev 10).
+    """
+    values = np.arange(math.floor(mean - 6 * stddev), math.ceil(mean + 6 * stddev) + 1)
+    # P(noise < value + 1); values past +-6 stddev would get no slot anyway
+    cdf = [0.5 * math.erfc((mean - value - 1) / (stddev * math.sqrt(2))) for value in values.tolist()]
+    ends = np.rint(np.array(cdf) * _GAUSSIAN_LUT_SIZE).astype(np.int64)
+    ends[-1] = _GAUSSIAN_LUT_SIZE
+    return np.repeat(values, np.diff(ends, prepend=0)).astype(np.int16)
+
+
+def _cached_gaussian_lut(mean: float, stddev: float) -> Optional[np.ndarray]:
+    """Return the table of (mean, stddev), or None the first time these parameters are used.
+
+    A table is only built once the same parameters come again, so parameters drawn at random for every
+    image keep to the float path instead of building a table per call.
+    """
+    key = (mean, stddev)
+    with _gaussian_luts_lock:
+        if key not in _gaussian_luts:
+            _gaussian_luts[key] = None
+            if len(_gaussian_luts) > _GAUSSIAN_LUT_CACHE_SIZE:
+                _gaussian_luts.popitem(last=False)
+            return None
+        _gaussian_luts.move_to_end(key)
+        lut = _gaussian_luts[key]
+    if lut is None:
+        lut = _build_gaussian_lut(mean, stddev)
+        with _gaussian_luts_lock:
+            if key in _gaussian_luts:
+                _gaussian_luts[key] = lut
+    return lut
 
 
 class NoiseTypes(Enum):
@@ -23,12 +97,14 @@ class NoiseTypes(Enum):
     SPECKLE = 4
 
 
-def noisify(image: np.ndarray, noise_type: NoiseTypes, **kwargs: Any) -> np.ndarray:
+def noisify(image: np.ndarray, noise_type: NoiseTypes, *, rng: Optional[np.random.Generator] = None,
+            **kwargs: Any) -> np.ndarray:
     """Add randomly sampled noise to an image.
 
     Args:
         image (np.ndarray): tensor representing an image
         noise_type (NoiseTypes): type of noise to use (e.g Gaussian, S&P, etc)
+        rng (np.random.Generator): source of randomness, a per-thread default generator is used if not given.
         amount (float): value within [0;1] range specifying ratio of all pixels in an image
             that will be distorted (only for Salt and Pepper noise).
         salt_vs_pepper (float): value within [0;1] that meet the equation 
@@ -39,32 +115,139 @@ def noisify(image: np.ndarray, noise_type: NoiseTypes, **kwargs: Any) -> np.ndar
         np.array: tensor representing the noised image
     """
 
-    noised = np.copy(image).astype('float32')
-    
+    if rng is None:
+        rng = _default_rng()
+
     if noise_type == NoiseTypes.SALT_AND_PEPPER:
         salt_vs_pepper = float(kwargs.get('salt_vs_pepper', 0.5))
         amount = float(kwargs.get('amount', 0.01))
+        # written in uint8 directly, no float32 copy needed
+        noised = image.astype('uint8')
+        _salt_pepper_in_place(noised, salt_vs_pepper, amount, rng)
+        return noised
 
-        if not (0.0 <= salt_vs_pepper <= 1.0 and 0.0 <= amount <= 1.0):
-            raise ValueError('salt_vs_pepper and amount ratios must be within [0;1] range')
-        
-        height, width = image.shape[:2]
-        num_distorted_pixels = height * width * amount
-
-        num_salt_pixels = int(num_distorted_pixels * salt_vs_pepper)
-        # salt i, j indices in an image
-        noised[randint(0, height - 1, num_salt_pixels), randint(0, width - 1, num_salt_pixels)] = 255.0
-
-        num_pepper_pixels = int(num_distorted_pixels * (1 - salt_vs_pepper)) 
-        # pepper i, j indices in an image
-        noised[randint(0, height - 1, num_pepper_pixels), randint(0, width - 1, num_pepper_pixels)] = 0.0
-    elif noise_type == NoiseTypes.GAUSSIAN:
-        noised = image + np.random.normal(loc=kwargs.get('mean', 0), scale=kwargs.get('stddev', 1), size=image.shape)
-    elif noise_type == NoiseTypes.SPECKLE:
-        noised = image + image * np.random.normal(loc=kwargs.get('mean', 0), scale=kwargs.get('stddev', 1), size=image.shape)
-    elif noise_type == NoiseTypes.POISSON: 
-        noised = np.random.poisson(lam=image, size=None)
-    else:
-        raise ValueError('Invalid noise type given. Must be one of NoiseTypes')
-    
-    return noised.astype('uint8')
+    if noise_type == NoiseTypes.GAUSSIAN and image.dtype == np.uint8:
+        mean = float(kwargs.get('mean', 0))
+        stddev = float(kwargs.get('stddev', 1))
+        lut = None
+        if 0 < stddev <= _GAUSSIAN_LUT_MAX_STDDEV and abs(mean) <= 255:
+            lut = _cached_gaussian_lut(mean, stddev)
+        if lut is not None:
+            # integer only: a table lookup per pixel instead of float noise, clipped in int16
+            slots = rng.integers(0, _GAUSSIAN_LUT_SIZE, size=image.shape, dtype=np.uint16)
+            noised = lut[slots]
+            np.add(noised, image, out=noised)
+            np.clip(noised, 0, 255, out=noised)
+            return noised.astype('uint8')
+
+    if noise_type == NoiseTypes.GAUSSIAN or noise_type == NoiseTypes.SPECKLE:
+        # a single float32 buffer first holds the noise, then the noised image
+        noised = rng.standard_normal(size=image.shape, dtype=np.float32)
+        noised *= kwargs.get('stddev', 1)
+        noised += kwargs.get('mean', 0)
+        if noise_type == NoiseTypes.SPECKLE:
+            np.multiply(noised, image, out=noised)
+        np.add(noised, image, out=noised)
+        np.clip(noised, 0, 255, out=noised)
+        return noised.astype('uint8')
+    if noise_type == NoiseTypes.POISSON:
+        # Generator.poisson always returns int64, counts are clipped in place so they saturate instead of wrapping
+        noised = rng.poisson(lam=image)
+        np.minimum(noised, 255, out=noised)
+        return noised.astype('uint8')
+
+    raise ValueError('Invalid noise type given. Must be one of NoiseTypes')
+
+
+def _salt_pepper_in_place(image: np.ndarray, salt_vs_pepper: float, amount: float,
+                          rng: np.random.Generator) -> None:
+    """Set round(amount * salt_vs_pepper) of the pixels to 255 and round(amount * (1 - salt_vs_pepper)) of them
+    to 0, as fractions of the pixel count; all channels of a pixel get the same value."""
+    if not (0.0 <= salt_vs_pepper <= 1.0 and 0.0 <= amount <= 1.0):
+        raise ValueError('salt_vs_pepper and amount ratios must be within [0;1] range')
+
+    height, width = image.shape[:2]
+    num_pixels = height * width
+    # each count is rounded once from its exact product; pepper is capped in case both round up past the image
+    num_salt_pixels = round(num_pixels * amount * salt_vs_pepper)
+    num_pepper_pixels = min(round(num_pixels * amount * (1 - salt_vs_pepper)), num_pixels - num_salt_pixels)
+
+    # distinct flat indices over the whole image, so exactly that many pixels are changed and salt never
+    # lands on pepper; they are unraveled rather than written through a reshape, which would silently copy
+    # images that aren't C contiguous (e.g. transposed)
+    distorted = rng.choice(num_pixels, num_salt_pixels + num_pepper_pixels, replace=False)
+    rows, cols = np.unravel_index(distorted, (height, width))
+    image[rows[:num_salt_pixels], cols[:num_salt_pixels]] = 255
+    image[rows[num_salt_pixels:], cols[num_salt_pixels:]] = 0
+
+
+def salt_pepper_noise(
+    image: np.ndarray,
+    salt_vs_pepper: float = 0.5,
+    amount: float = 0.01,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Replace random pixels of an image with salt (255) and pepper (0) values.
+
+    Same noise as `noisify` with `NoiseTypes.SALT_AND_PEPPER`, but the result keeps the dtype of the input image.
+
+    Args:
+        image (np.ndarray): tensor representing an image
+        salt_vs_pepper (float): value within [0;1], share of salt among the distorted pixels.
+        amount (float): value within [0;1], ratio of all pixels in the image that are distorted.
+        rng (np.random.Generator): source of randomness, a per-thread default generator is used if not given.
+
+    Returns:
+        np.array: tensor representing the noised image
+    """
+    if rng is None:
+        rng = _default_rng()
+
+    noised = image.copy()
+    _salt_pepper_in_place(noised, salt_vs_pepper, amount, rng)
+    return noised
+
+
+def composite_noise(
+    image: np.ndarray,
+    gaussian: Optional[Tuple[float, float]] = None,
+    speckle: Sequence[Tuple[float, float]] = (),
+    salt_pepper: Optional[Tuple[float, float]] = None,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Add gaussian, speckle and salt-and-pepper noise to an image in a single pass.
+
+    Gives the same kind of result as chaining the corresponding `noisify` calls, but all noise is accumulated
+    in one float32 buffer which is clipped to the uint8 range only once, at the end. A float32 image is
+    returned as float32 (still clipped to [0;255]), which saves the cast when the next step works on floats.
+
+    Args:
+        image (np.ndarray): tensor representing an image
+        gaussian (tuple): (mean, stddev) of the additive gaussian noise, None to skip it.
+        speckle (sequence): (mean, stddev) pairs of multiplicative noise, applied in order.
+        salt_pepper (tuple): (salt_vs_pepper, amount) of the salt and pepper noise, None to skip it.
+        rng (np.random.Generator): source of randomness, a per-thread default generator is used if not given.
+
+    Returns:
+        np.array: tensor representing the noised image
+    """
+    if rng is None:
+        rng = _default_rng()
+
+    noised = image.astype(np.float32)
+
+    if gaussian is not None:
+        mean, stddev = gaussian
+        noised += rng.normal(loc=mean, scale=stddev, size=noised.shape)
+
+    for mean, stddev in speckle:
+        noised += noised * rng.normal(loc=mean, scale=stddev, size=noised.shape)
+
+    if salt_pepper is not None:
+        salt_vs_pepper, amount = salt_pepper
+        _salt_pepper_in_place(noised, salt_vs_pepper, amount, rng)
+
+    np.clip(noised, 0, 255, out=noised)
+    if image.dtype == np.float32:
+        return noised
+    return noised.astype(np.uint8)
@@ -1,10 +1,31 @@
 """Perspective transform utility."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Optional, Tuple
 
 import cv2
 import numpy as np
 
+from .io_utils import write_jpeg
+from .transformations import build_perspective_maps
+
+# decode reductions libjpeg does in the DCT domain, largest first
+_REDUCED_READS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def _pick_reduction(pts1: np.ndarray, width: int, height: int) -> Tuple[int, int]:
+    """Return the largest decode reduction keeping the quad at least twice the output size, with its imread flag."""
+    quad_width, quad_height = np.ptp(pts1, axis=0)
+    for factor, flag in _REDUCED_READS:
+        if quad_width / factor >= 2 * width and quad_height / factor >= 2 * height:
+            return factor, flag
+    return 1, cv2.IMREAD_COLOR
+
 
 def perspective_transform(
     input_dir: str,
@@ -20,8 +41,16 @@ def perspective_transform(
     x4: int,
     y4: int,
     output_dir: str = None,
+    maps: Optional[Tuple[np.ndarray, np.ndarray]] = None,
 ) -> None:
-    """Apply a perspective transform to a single image."""
+    """Apply a perspective transform to a single image.
+
+    `maps` can hold the result of `transformations.build_perspective_maps` for these points and output size,
+    which saves computing the transform again when many images share the same geometry.
+
+    Without maps, an image whose quad is much larger than the output is decoded at a reduced size (1/2, 1/4
+    or 1/8), as long as the quad stays at least twice as large as the output.
+    """
     if not os.path.isdir(input_dir):
         raise ValueError('Invalid images directory path specified.')
 
@@ -29,15 +58,26 @@ def perspective_transform(
     if not os.path.isfile(image_path):
         raise ValueError('Input image not found.')
 
-    image = cv2.imread(image_path)
-    if image is None:
-        raise ValueError('Unable to read input image.')
-
     pts1 = np.float32([[x1, y1], [x2, y2], [x3, y3], [x4, y4]])
     pts2 = np.float32([[0, 0], [width, 0], [0, height], [width, height]])
 
-    matrix = cv2.getPerspectiveTransform(pts1, pts2)
-    result_image = cv2.warpPerspective(image, matrix, (width, height))
+    # the precomputed maps are in full resolution coordinates
+    reduction, read_flag = 1, cv2.IMREAD_COLOR
+    if maps is None:
+        reduction, read_flag = _pick_reduction(pts1, width, height)
+
+    image = cv2.imread(image_path, read_flag)
+    if image is None:
+        raise ValueError('Unable to read input image.')
+
+    if maps is not None:
+        result_image = cv2.remap(image, maps[0], maps[1], cv2.INTER_LINEAR)
+    else:
+        if reduction > 1:
+            # every pixel of the reduced image covers a reduction x reduction block of the original
+            pts1 = (pts1 + 0.5) / reduction - 0.5
+        matrix = cv2.getPerspectiveTransform(pts1, pts2)
+        result_image = cv2.warpPerspective(image, matrix, (width, height))
 
     if output_dir is None:
         output_dir = os.path.join(input_dir, 'perspective_transformed_images')
@@ -47,4 +87,42 @@ def perspective_transform(
         output_dir,
         f'{os.path.splitext(filename)[0]}_perspective.jpg'
     )
-    cv2.imwrite(output_path, result_image)
+    write_jpeg(output_path, result_image)
+
+
+def perspective_transform_batch(
+    input_dir: str,
+    filenames: Iterable[str],
+    width: int,
+    height: int,
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+    x3: int,
+    y3: int,
+    x4: int,
+    y4: int,
+    output_dir: str = None,
+    num_workers: Optional[int] = None,
+) -> None:
+    """Apply the same perspective transform to several images.
+
+    Images are processed in a thread pool, as OpenCV releases the GIL while decoding, warping and encoding.
+    Unless the sources are decoded at a reduced size, the remap maps are computed once for all images.
+    """
+    pts1 = np.float32([[x1, y1], [x2, y2], [x3, y3], [x4, y4]])
+    pts2 = np.float32([[0, 0], [width, 0], [0, height], [width, height]])
+
+    maps = None
+    if _pick_reduction(pts1, width, height)[0] == 1:
+        maps = build_perspective_maps(pts1, pts2, width, height)
+
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        futures = [
+            executor.submit(perspective_transform, input_dir, filename, width, height,
+                            x1, y1, x2, y2, x3, y3, x4, y4, output_dir=output_dir, maps=maps)
+            for filename in filenames
+        ]
+        for future in futures:
+            future.result()
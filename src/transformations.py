@@ -1,72 +1,193 @@
 """Basic geometric transformations for images."""
 
+import threading
+from functools import lru_cache
+from typing import Optional, Sequence, Tuple
+
 import cv2 as cv
 import numpy as np
 
+# warpAffine copies the matrix it is given, so the functions below that only pass a matrix on to it fill a
+# per-thread 2x3 buffer instead of building a new array from nested lists on every call
+_matrix_state = threading.local()
+
+
+def _matrix_buffer() -> np.ndarray:
+    """Return the 2x3 scratch matrix of the calling thread, its content is only valid until the next call."""
+    M = getattr(_matrix_state, 'M', None)
+    if M is None:
+        M = _matrix_state.M = np.empty((2, 3), dtype=np.float64)
+    return M
+
+
+def _border(image: np.ndarray, border_value: int):
+    """Return the constant border color for an image with any number of channels."""
+    if image.ndim == 3:
+        return (border_value,) * image.shape[2]
+    return border_value
+
+
+def resize(image: np.ndarray, width: int, height: int, interpolation=cv.INTER_LINEAR,
+           out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Resize an image to a target width/height.
 
-def resize(image: np.ndarray, width: int, height: int, interpolation=cv.INTER_LINEAR) -> np.ndarray:
-    """Resize an image to a target width/height."""
-    resized = cv.resize(image, (width, height), interpolation)
+    Like the other transformations, the result is written into `out` when it is given and has the right
+    shape and dtype, which saves an allocation per call when a buffer is reused across images.
+    """
+    resized = cv.resize(image, (width, height), dst=out, interpolation=interpolation)
     return resized
 
 
-def translate(image: np.ndarray, twidth: int, theight: int) -> np.ndarray:
+def resize_matrix(source_size: Tuple[int, int], target_size: Tuple[int, int]) -> np.ndarray:
+    """Return the 2x3 matrix that maps an image of the source size onto the target size, with the same
+    pixel center alignment as `cv.resize`."""
+    source_width, source_height = source_size
+    target_width, target_height = target_size
+    kx = target_width / source_width
+    ky = target_height / source_height
+    return np.array([[kx, 0, 0.5 * (kx - 1)], [0, ky, 0.5 * (ky - 1)]])
+
+
+def translation_matrix(twidth: int, theight: int) -> np.ndarray:
+    """Return the 2x3 matrix shifting an image by (twidth, theight)."""
+    return np.float32([[1, 0, twidth], [0, 1, theight]])
+
+
+def translate(image: np.ndarray, twidth: int, theight: int, out: Optional[np.ndarray] = None) -> np.ndarray:
     """Translate (shift) an image by (twidth, theight)."""
     rows, cols = image.shape[:2]
-    M = np.float32([[1, 0, twidth], [0, 1, theight]])
-    translated = cv.warpAffine(image, M, (cols, rows))
+    M = _matrix_buffer()
+    M[0, 0] = 1
+    M[0, 1] = 0
+    M[0, 2] = twidth
+    M[1, 0] = 0
+    M[1, 1] = 1
+    M[1, 2] = theight
+    translated = cv.warpAffine(image, M, (cols, rows), dst=out)
     return translated
 
 
-def rotate(image: np.ndarray, angle: float, center: (int, int), border_value: int = 255) -> np.ndarray:
-    """Rotate an image around a center and pad with a constant color."""
-    height, width = image.shape[:2]
-    x, y = center
+@lru_cache(maxsize=256)
+def _build_rotation(angle: float, width: int, height: int, center_x: float, center_y: float
+                    ) -> Tuple[Tuple[float, ...], int, int]:
+    """Return the row-major 2x3 no-crop rotation matrix as a tuple, and the expanded canvas width/height.
 
-    # M = cv.getRotationMatrix2D((x, y), angle, 1)
+    Cached, as the same rotation is needed for an image and again for the points annotated on it.
+    """
+    M = cv.getRotationMatrix2D((center_x, center_y), angle, 1.0)
 
-    theta = angle / 180.0 * np.pi
-    cos_t = np.cos(theta)
-    sin_t = np.sin(theta)
-    M = np.float32([[cos_t, sin_t, x - x * cos_t - y * sin_t], [-sin_t, cos_t, y + x * sin_t - y * cos_t]])
+    # the expanded canvas is the extent of the rotated image corners, which also holds past +-90 degrees
+    corners = np.array([[0, 0], [width, 0], [width, height], [0, height]], dtype=np.float64)
+    new_width, new_height = np.ptp(corners @ M[:, :2].T, axis=0).astype(int).tolist()
 
-    new_width = int(height * np.abs(sin_t) + width * cos_t)
-    new_height = int(height * cos_t + width * np.abs(sin_t))
+    M[0, 2] += (new_width / 2) - center_x
+    M[1, 2] += (new_height / 2) - center_y
+    return tuple(M.ravel().tolist()), new_width, new_height
 
-    M[0, 2] += (new_width / 2) - x
-    M[1, 2] += (new_height / 2) - y
 
-    border = border_value
-    if image.ndim == 3:
-        border = (border_value,) * image.shape[2]
+def rotation_matrix(angle: float, center: (int, int), size: (int, int)) -> Tuple[np.ndarray, Tuple[int, int]]:
+    """Return the 2x3 matrix rotating an image of the given size around a center without cropping,
+    along with the size of the expanded canvas."""
+    width, height = size
+    x, y = center
+    M, new_width, new_height = _build_rotation(angle, width, height, x, y)
+    return np.array(M).reshape(2, 3), (new_width, new_height)
+
+
+def rotate(image: np.ndarray, angle: float, center: (int, int), border_value: int = 255,
+           out: Optional[np.ndarray] = None) -> np.ndarray:
+    """Rotate an image around a center and pad with a constant color."""
+    height, width = image.shape[:2]
+    x, y = center
+    values, new_width, new_height = _build_rotation(angle, width, height, x, y)
+    M = _matrix_buffer()
+    M[0, 0], M[0, 1], M[0, 2], M[1, 0], M[1, 1], M[1, 2] = values
+    new_size = (new_width, new_height)
 
     rotated = cv.warpAffine(
         image,
         M,
-        (new_width, new_height),
+        new_size,
+        dst=out,
         flags=cv.INTER_LINEAR,
         borderMode=cv.BORDER_CONSTANT,
-        borderValue=border,
+        borderValue=_border(image, border_value),
     )
     return rotated
 
 
-def scale(image: np.ndarray, kwidth: float, kheight: float, center: (int, int)) -> np.ndarray:
+def scale_matrix(kwidth: float, kheight: float, center: (int, int)) -> np.ndarray:
+    """Return the 2x3 matrix scaling an image about a center point."""
+    x, y = center
+    return np.float32([[kwidth, 0, x * (1 - kwidth)], [0, kheight, y * (1 - kheight)]])
+
+
+def scale(image: np.ndarray, kwidth: float, kheight: float, center: (int, int),
+          out: Optional[np.ndarray] = None) -> np.ndarray:
     """Scale an image about a center point."""
     rows, cols = image.shape[:2]
     x, y = center
-    M = np.float32([[kwidth, 0, x * (1 - kwidth)], [0, kheight, y * (1 - kheight)]])
-    scaled = cv.warpAffine(image, M, (cols, rows))
+    M = _matrix_buffer()
+    M[0, 0] = kwidth
+    M[0, 1] = 0
+    M[0, 2] = x * (1 - kwidth)
+    M[1, 0] = 0
+    M[1, 1] = kheight
+    M[1, 2] = y * (1 - kheight)
+    scaled = cv.warpAffine(image, M, (cols, rows), dst=out)
     return scaled
 
 
-def affine_transform(image: np.ndarray, pts1: np.float32, pts2: np.float32) -> np.ndarray:
+def affine_transform(image: np.ndarray, pts1: np.float32, pts2: np.float32,
+                     out: Optional[np.ndarray] = None) -> np.ndarray:
     """Apply an affine transform to an image."""
     rows, cols = image.shape[:2]
     M = cv.getAffineTransform(pts1, pts2)
-    transformed = cv.warpAffine(image, M, (cols, rows))
+    transformed = cv.warpAffine(image, M, (cols, rows), dst=out)
     return transformed
 
 
+def compose_affine(matrices: Sequence[np.ndarray]) -> np.ndarray:
+    """Return the single 2x3 matrix equivalent to applying the given 2x3 matrices in order."""
+    composed = np.eye(3)
+    for M in matrices:
+        composed = np.vstack([M, (0, 0, 1)]) @ composed
+    return composed[:2]
+
+
+def fused_affine(
+    image: np.ndarray,
+    matrices: Sequence[np.ndarray],
+    out_size: Tuple[int, int],
+    interpolation=cv.INTER_LINEAR,
+    border_value: int = 255,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Apply a chain of affine transforms with a single `cv.warpAffine`.
+
+    The image is resampled once instead of once per transform, which saves the intermediate images and
+    the blur every extra interpolation adds.
+    """
+    return cv.warpAffine(
+        image,
+        compose_affine(matrices),
+        out_size,
+        dst=out,
+        flags=interpolation,
+        borderMode=cv.BORDER_CONSTANT,
+        borderValue=_border(image, border_value),
+    )
+
 
+def build_perspective_maps(pts1: np.ndarray, pts2: np.ndarray, width: int, height: int
+                           ) -> Tuple[np.ndarray, np.ndarray]:
+    """Return `cv.remap` maps of the perspective transform taking pts1 to pts2, for a width x height output.
 
+    Warping with the maps gives the same result as `cv.warpPerspective`, but the per-pixel source coordinates
+    are only computed once, so images sharing the same geometry are transformed with a plain `cv.remap`.
+    """
+    M = cv.getPerspectiveTransform(np.float32(pts1), np.float32(pts2))
+    xs, ys = np.meshgrid(np.arange(width, dtype=np.float32), np.arange(height, dtype=np.float32))
+    source = cv.perspectiveTransform(np.dstack([xs, ys]), np.linalg.inv(M))
+    # fixed-point maps with interpolation weights, the fastest format for cv.remap
+    return cv.convertMaps(source, None, cv.CV_16SC2)
@@ -1,9 +1,12 @@
 """Geometry helpers for point transformations."""
 
+import math
 from typing import Tuple
 
 import numpy as np
 
+from .transformations import rotation_matrix
+
 Point2D = Tuple[int, int]
 Size2D = Tuple[int, int]
 
@@ -22,32 +25,35 @@ def scale_point2d(src_point: Point2D, original_size: Size2D, target_size: Size2D
 
 def rotate_point2d(src_point: Point2D, angle: float, center: Point2D, radians: bool = False) -> Point2D:
     """Rotate a point around a center by the given angle."""
-    angle_rad = angle if radians else angle * np.pi / 180
+    angle_rad = angle if radians else angle * math.pi / 180
+    cos_t = math.cos(angle_rad)
+    sin_t = math.sin(angle_rad)
 
     (x1, y1), (x0, y0) = src_point, center
-    rotated_x = (x1 - x0) * np.cos(angle_rad) + (y1 - y0) * np.sin(angle_rad) + x0
-    rotated_y = -(x1 - x0) * np.sin(angle_rad) + (y1 - y0) * np.cos(angle_rad) + y0
+    rotated_x = (x1 - x0) * cos_t + (y1 - y0) * sin_t + x0
+    rotated_y = -(x1 - x0) * sin_t + (y1 - y0) * cos_t + y0
 
     return round(rotated_x), round(rotated_y)
 
 
 def rotate_point2d_no_crop(src_point: Point2D, angle: float, center: Point2D, img_size: Size2D) -> Point2D:
     """Rotate a point using the expanded canvas size (no cropping)."""
-    width, height = img_size
-    center_x, center_y = center
     point_x, point_y = src_point
 
-    theta = angle / 180.0 * np.pi
-    cos_t = np.cos(theta)
-    sin_t = np.sin(theta)
+    # same (cached) matrix transformations.rotate warps the image with
+    M, _ = rotation_matrix(angle, center, img_size)
+    (m00, m01, m02), (m10, m11, m12) = M.tolist()
+    rotated_x = m00 * point_x + m01 * point_y + m02
+    rotated_y = m10 * point_x + m11 * point_y + m12
 
-    rotated_x = (point_x - center_x) * cos_t + (point_y - center_y) * sin_t + center_x
-    rotated_y = -(point_x - center_x) * sin_t + (point_y - center_y) * cos_t + center_y
+    return round(rotated_x), round(rotated_y)
 
-    new_width = int(height * np.abs(sin_t) + width * cos_t)
-    new_height = int(height * cos_t + width * np.abs(sin_t))
 
-    rotated_x += (new_width / 2) - center_x
-    rotated_y += (new_height / 2) - center_y
+def rotate_points2d_no_crop(points: np.ndarray, angle: float, center: Point2D, img_size: Size2D) -> np.ndarray:
+    """Rotate an (N, 2) array of points using the expanded canvas size (no cropping).
 
-    return round(rotated_x), round(rotated_y)
+    Vectorized version of `rotate_point2d_no_crop`, the rotation is computed once for all points.
+    """
+    M, _ = rotation_matrix(angle, center, img_size)
+    rotated = np.asarray(points, dtype=np.float64) @ M[:, :2].T + M[:, 2]
+    return np.rint(rotated).astype(np.int64)
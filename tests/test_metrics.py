@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from src import metrics
+from src.metrics import _bit_parallel_edit_distance, calculate_edit_distance
+
+
+def _reference_edit_distance(a: str, b: str) -> int:
+    """Plain O(len(a) * len(b)) Levenshtein DP."""
+    previous = list(range(len(b) + 1))
+    for i, character in enumerate(a, 1):
+        current = [i]
+        for j, other in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (character != other)))
+        previous = current
+    return previous[-1]
+
+
+def _random_text(rng: random.Random, length: int, alphabet: str) -> str:
+    return ''.join(rng.choice(alphabet) for _ in range(length))
+
+
+def _cases():
+    rng = random.Random(0)
+    cases = [
+        ('', ''),
+        ('', 'abc'),
+        ('abc', ''),
+        ('kitten', 'sitting'),
+        ('a' * 70, 'a' * 65 + 'b' * 10),
+        ('\U0001F600a\U00010348', 'a\U0001F600\U0001F601'),
+    ]
+    # pattern lengths around the machine word and the numba dispatch boundary
+    for length in (63, 64, 65, 130, metrics._NUMBA_MAX_PATTERN_LENGTH, metrics._NUMBA_MAX_PATTERN_LENGTH + 1):
+        for alphabet in ('ab', 'abcdefgh \n', 'a\U0001F600\U00010348'):
+            pattern = _random_text(rng, length, alphabet)
+            text = _random_text(rng, length + rng.randrange(0, 40), alphabet)
+            cases.append((pattern, text))
+    for _ in range(200):
+        cases.append((_random_text(rng, rng.randrange(0, 20), 'abc'), _random_text(rng, rng.randrange(0, 20), 'abc')))
+    return cases
+
+
+class EditDistanceTest(unittest.TestCase):
+    def _check(self, distance) -> None:
+        for a, b in _cases():
+            with self.subTest(a=a, b=b):
+                self.assertEqual(distance(a, b), _reference_edit_distance(a, b))
+
+    def test_bit_parallel(self) -> None:
+        def distance(a, b):
+            return _bit_parallel_edit_distance(*sorted((a, b), key=len))
+
+        self._check(distance)
+
+    @unittest.skipIf(metrics._numba_edit_distance() is None, 'numba is not installed')
+    def test_numba(self) -> None:
+        self._check(lambda a, b: metrics._numba_edit_distance()(*sorted((a, b), key=len, reverse=True)))
+
+    @unittest.skipIf(metrics.Levenshtein is None, 'rapidfuzz is not installed')
+    def test_rapidfuzz(self) -> None:
+        self._check(metrics.Levenshtein.distance)
+
+    def test_dispatch(self) -> None:
+        self._check(calculate_edit_distance)
+
+
+if __name__ == '__main__':
+    unittest.main()
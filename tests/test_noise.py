@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+
+from src.noise import NoiseTypes, composite_noise, noisify, salt_pepper_noise
+
+
+def _layouts(image: np.ndarray):
+    """The same pixels in C order, transposed and in Fortran order."""
+    return {
+        'c': image,
+        'transposed': np.ascontiguousarray(image.T).T,
+        'fortran': np.asfortranarray(image),
+    }
+
+
+class SaltPepperTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.image = np.full((40, 200), 128, dtype=np.uint8)
+
+    def _check_counts(self, noised, num_salt, num_pepper) -> None:
+        self.assertEqual(np.count_nonzero(noised == 255), num_salt)
+        self.assertEqual(np.count_nonzero(noised == 0), num_pepper)
+        self.assertEqual(np.count_nonzero(noised == 128), noised.size - num_salt - num_pepper)
+
+    def test_noisify_counts(self) -> None:
+        for name, image in _layouts(self.image).items():
+            with self.subTest(layout=name):
+                noised = noisify(image, NoiseTypes.SALT_AND_PEPPER, amount=0.1, salt_vs_pepper=0.25,
+                                 rng=np.random.default_rng(0))
+                self._check_counts(noised, 200, 600)
+                np.testing.assert_array_equal(image, self.image)
+
+    def test_salt_pepper_noise_counts(self) -> None:
+        for name, image in _layouts(self.image.astype(np.float32)).items():
+            with self.subTest(layout=name):
+                noised = salt_pepper_noise(image, salt_vs_pepper=0.5, amount=0.1, rng=np.random.default_rng(0))
+                self.assertEqual(noised.dtype, np.float32)
+                self._check_counts(noised, 400, 400)
+
+    def test_composite_noise_counts(self) -> None:
+        for name, image in _layouts(self.image).items():
+            with self.subTest(layout=name):
+                noised = composite_noise(image, salt_pepper=(0.75, 0.1), rng=np.random.default_rng(0))
+                self._check_counts(noised, 600, 200)
+
+    def test_whole_image(self) -> None:
+        # every pixel is distorted, including the last row and column
+        for name, image in _layouts(self.image).items():
+            with self.subTest(layout=name):
+                noised = noisify(image, NoiseTypes.SALT_AND_PEPPER, amount=1.0, salt_vs_pepper=0.5,
+                                 rng=np.random.default_rng(0))
+                self._check_counts(noised, 4000, 4000)
+                self.assertFalse((noised[-1] == 128).any())
+                self.assertFalse((noised[:, -1] == 128).any())
+
+    def test_channels_share_the_value(self) -> None:
+        image = np.full((40, 200, 3), 128, dtype=np.uint8)
+        noised = salt_pepper_noise(image, salt_vs_pepper=0.5, amount=0.1, rng=np.random.default_rng(0))
+        self.assertTrue((noised == noised[..., :1]).all())
+        self._check_counts(noised[..., 0], 400, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,5 @@
 import shutil
+import tempfile
 import unittest
 from pathlib import Path
 
@@ -63,3 +64,35 @@ class SmokeTest(unittest.TestCase):
         degraded_images_dir = degraded_dir / 'images'
         assert degraded_images_dir.is_dir()
         assert any(degraded_images_dir.iterdir())
+
+    def test_degraded_dataset_is_independent_of_worker_count(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            clear_dir = Path(tmp_dir) / 'clear'
+            generate_clear_text_images(
+                text_file_path=ROOT_DIR / 'data/The_Picture_of_Dorian_Gray.txt',
+                output_dir=str(clear_dir),
+                num_images=6
+            )
+
+            outputs = []
+            for num_workers in (1, 2):
+                degraded_dir = Path(tmp_dir) / f'degraded_workers_{num_workers}'
+                # default rotation and resize ranges, so the fused warp and the process pool both run
+                generate_degraded_dataset(
+                    images_dir=str(clear_dir / 'images'),
+                    annotations_path=str(clear_dir / 'annotations.json'),
+                    output_dir=str(degraded_dir),
+                    seed=5,
+                    run_tesseract=False,
+                    num_workers=num_workers,
+                    compute_psnr=False,
+                )
+                images = sorted((degraded_dir / 'images').iterdir())
+                outputs.append((
+                    [image.name for image in images],
+                    [image.read_bytes() for image in images],
+                    (degraded_dir / 'annotations.json').read_bytes(),
+                ))
+
+        assert len(outputs[0][0]) == 6
+        assert outputs[0] == outputs[1]